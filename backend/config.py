@@ -13,6 +13,12 @@ class Settings(BaseSettings):
     WHISPER_MODEL: str = "whisper-large-v3"
     MAX_QUESTIONS: int = 10
     DEFAULT_QUESTIONS: int = 5
+    QUESTION_INDEX_PATH: str = "data/question_index.jsonl"
+    QUESTION_INDEX_MAX_ENTRIES: int = 200_000
+    QUESTION_INDEX_MAX_PER_CANDIDATE_ROLE: int = 1_000
+    QUESTION_INDEX_MAX_CANDIDATE_ROLES: int = 50_000
+    QUESTION_DUPLICATE_THRESHOLD: float = 0.3
+    QUESTION_REGENERATE_ATTEMPTS: int = 2
 
     class Config:
         env_file = ".env"
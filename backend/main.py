@@ -1,14 +1,28 @@
 """AI Interview Simulator — FastAPI Backend Entry Point."""
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from routers import interview, resume
+from services import question_index
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load the question index off the event loop before serving, flush it on shutdown."""
+    index = await asyncio.to_thread(question_index.get_index)
+    yield
+    await index.flush()
+
 
 app = FastAPI(
     title="AI Interview Simulator",
     description="An AI-powered mock interview system with voice input, LLM evaluation, and sentiment scoring.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS — allow the React dev server
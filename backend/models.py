@@ -22,9 +22,13 @@ class InterviewRole(str, Enum):
 
 class InterviewStartRequest(BaseModel):
     """Request to start a new interview session."""
-    role: str = Field(..., description="Interview role/position")
+    role: str = Field(..., max_length=100, description="Interview role/position")
     num_questions: int = Field(default=5, ge=1, le=10, description="Number of questions")
     resume_text: Optional[str] = Field(default=None, description="Extracted resume text")
+    candidate_id: str = Field(
+        default="default", min_length=1, max_length=64,
+        description="Candidate identifier used to avoid repeating questions",
+    )
 
 
 class InterviewStartResponse(BaseModel):
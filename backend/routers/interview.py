@@ -2,13 +2,14 @@
 
 import uuid
 from datetime import datetime, timezone
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, Form, HTTPException
 
 from models import (
     InterviewStartRequest, InterviewStartResponse,
     AnswerFeedback, QuestionAnswer, SessionSummary, SessionListItem
 )
-from services import llm_service, stt_service, sentiment_service
+from config import get_settings
+from services import llm_service, stt_service, sentiment_service, question_index
 
 router = APIRouter(prefix="/api/interview", tags=["Interview"])
 
@@ -17,15 +18,13 @@ sessions: dict[str, dict] = {}
 
 
 @router.post("/start", response_model=InterviewStartResponse)
-async def start_interview(req: InterviewStartRequest):
+async def start_interview(req: InterviewStartRequest, background_tasks: BackgroundTasks):
     """Start a new interview session — generates questions and returns the first one."""
     session_id = str(uuid.uuid4())[:8]
 
-    questions = await llm_service.generate_questions(
-        role=req.role,
-        num_questions=req.num_questions,
-        resume_text=req.resume_text,
-    )
+    questions = await _generate_fresh_questions(req)
+    # Persist newly recorded questions after the response is sent
+    background_tasks.add_task(question_index.get_index().flush)
 
     sessions[session_id] = {
         "session_id": session_id,
@@ -47,6 +46,47 @@ async def start_interview(req: InterviewStartRequest):
     )
 
 
+async def _generate_fresh_questions(req: InterviewStartRequest) -> list[str]:
+    """Generate questions, regenerating any the candidate has already been asked for this role."""
+    index = question_index.get_index()
+    fresh: list[str] = []
+    repeats: list[str] = []
+
+    for _ in range(get_settings().QUESTION_REGENERATE_ATTEMPTS + 1):
+        try:
+            batch = await llm_service.generate_questions(
+                role=req.role,
+                num_questions=req.num_questions - len(fresh),
+                resume_text=req.resume_text,
+                avoid=(fresh + repeats) or None,
+            )
+        except Exception:
+            # Nothing to serve yet, so surface the error. Otherwise keep what this
+            # request already has: its fresh questions are recorded as asked, and
+            # must reach the candidate.
+            if not fresh and not repeats:
+                raise
+            break
+
+        # Record fresh questions before the next await so later rounds and any
+        # concurrent /start for the same candidate and role see them as asked.
+        new, duplicates = index.filter_new(req.candidate_id, req.role, batch)
+        index.record(req.candidate_id, req.role, new)
+        fresh.extend(new)
+        repeats.extend(duplicates)
+        if len(fresh) >= req.num_questions or not batch:
+            break
+
+    # Fall back to repeats of earlier sessions rather than running a short
+    # interview, but never serve the same question twice within this one.
+    # Repeats are not recorded again, so they don't crowd older history out of the index.
+    repeats = index.distinct(repeats, exclude=fresh)
+    questions = (fresh + repeats)[:req.num_questions]
+    if not questions:
+        raise HTTPException(status_code=502, detail="Failed to generate interview questions")
+    return questions
+
+
 @router.post("/answer/text", response_model=AnswerFeedback)
 async def submit_text_answer(session_id: str = Form(...), answer_text: str = Form(...)):
     """Submit a text-based answer for the current question."""
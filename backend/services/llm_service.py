@@ -14,8 +14,17 @@ def _get_client():
     return _client
 
 
-async def generate_questions(role: str, num_questions: int = 5, resume_text: str | None = None) -> list[str]:
-    """Generate role-specific interview questions using GPT-4o."""
+async def generate_questions(
+    role: str,
+    num_questions: int = 5,
+    resume_text: str | None = None,
+    avoid: list[str] | None = None,
+) -> list[str]:
+    """Generate role-specific interview questions using GPT-4o.
+
+    `avoid` lists questions the candidate has already seen; the model is asked
+    not to repeat or closely rephrase them.
+    """
 
     resume_context = ""
     if resume_text:
@@ -24,12 +33,20 @@ The candidate has provided their resume. Use it to personalize some questions:
 --- RESUME ---
 {resume_text[:3000]}
 --- END RESUME ---
+"""
+
+    avoid_context = ""
+    if avoid:
+        avoid_list = "\n".join(f"- {q}" for q in avoid[:20])
+        avoid_context = f"""
+The candidate has already been asked the following. Do NOT repeat or rephrase them:
+{avoid_list}
 """
 
     prompt = f"""You are an expert technical interviewer. Generate exactly {num_questions} interview questions for a {role} position.
 
 {resume_context}
-
+{avoid_context}
 Requirements:
 - Mix of technical, behavioral, and situational questions
 - Progress from easier to harder
@@ -0,0 +1,452 @@
+"""Local near-duplicate index over previously asked interview questions.
+
+Questions are reduced to MinHash signatures over their content words and
+adjacent word pairs, and bucketed per (candidate, role). Each bucket keeps
+its signatures in a single band-major bytearray, so a lookup is a C-level
+scan of each band followed by a full signature comparison for the few rows
+that share several bands. Only signatures are kept, never the question
+text. Memory is about 330 bytes per question plus about 300 bytes per
+(candidate, role) pair. At the default caps (200k questions, 50k pairs) that
+stays under ~90 MB however the questions are spread. An append-only JSONL
+log on disk is compacted as old entries are evicted.
+
+Matching is lexical. Paraphrases that share few content words ("hash map
+internals" vs "a hashmap under the hood") are not caught.
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import re
+import sys
+from array import array
+from collections import Counter, deque
+from typing import Iterator
+
+from config import get_settings
+
+NUM_BANDS = 40
+ROWS_PER_BAND = 2
+NUM_PERM = NUM_BANDS * ROWS_PER_BAND
+
+# Rows must share this many whole bands before their signatures are compared.
+# Unrelated questions rarely share even one; a pair at the default threshold
+# shares two or more ~90% of the time, rising to ~99% at 0.4 similarity.
+MIN_BAND_HITS = 2
+
+_BAND_BYTES = ROWS_PER_BAND * 4
+# memoryview format with one item per band (two uint32 lanes)
+_BAND_FORMAT = "Q"
+_SIGNATURE_BYTES = NUM_PERM * 4
+# Bit 0 of every 32-bit lane, for counting lanes in a whole signature at once
+_LANE_LOW_BITS = int.from_bytes(b"\x01\x00\x00\x00" * NUM_PERM, "little")
+_TOKEN_RE = re.compile(r"\w+")
+
+# Question scaffolding that says nothing about what is being asked.
+_STOPWORDS = frozenset("""
+    a an the and or but of to in on at for with by from as into under over
+    is are was were be been being do does did can could would should will may might must
+    how what why when where which who whom whose if then than so some any
+    i me my we our us you your yours it its this that these those there their they them
+    tell describe explain walk through give example about please between s re ve ll d t
+    use using used work works working handle manage approach ensure most
+""".split())
+
+
+def _stem(word: str) -> str:
+    """Fold plurals (Porter step 1a) so "threads" matches "thread"."""
+    if word.endswith("sses"):
+        return word[:-2]
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")) and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def _shingles(text: str) -> set[str]:
+    """Content words of text plus each unordered pair of neighbouring words."""
+    text = text.casefold()
+    words = _TOKEN_RE.findall(text)
+    content = [_stem(w) for w in words if w not in _STOPWORDS] or words
+    if not content:
+        # Nothing word-like; fall back to the raw text so unrelated inputs don't collide
+        return {text.strip()}
+
+    shingles = set(content)
+    shingles.update(" ".join(sorted(pair)) for pair in zip(content, content[1:]))
+    return shingles
+
+
+def signature(text: str) -> bytes:
+    """Compute a compact MinHash signature (NUM_PERM uint32 values) for text.
+
+    Each shingle is hashed once with SHAKE-128; lane i of the digest serves as
+    the i-th hash function, so the signature is the lane-wise minimum.
+    """
+    rows = [
+        array("I", hashlib.shake_128(s.encode()).digest(_SIGNATURE_BYTES))
+        for s in _shingles(text)
+    ]
+    if len(rows) == 1:
+        return rows[0].tobytes()
+    return array("I", map(min, *rows)).tobytes()
+
+
+def similarity(sig_a: bytes, sig_b: bytes) -> float:
+    """Estimate Jaccard similarity from two signatures."""
+    # Fold each 32-bit lane of the XOR into its low bit: 1 where the lanes differ
+    x = int.from_bytes(sig_a, "little") ^ int.from_bytes(sig_b, "little")
+    x |= x >> 16
+    x |= x >> 8
+    x |= x >> 4
+    x |= x >> 2
+    x |= x >> 1
+    return (NUM_PERM - (x & _LANE_LOW_BITS).bit_count()) / NUM_PERM
+
+
+def _bucket_key(candidate_id: str, role: str) -> tuple[str, str]:
+    # Interned so buckets of the same candidate or role share one string
+    return sys.intern(candidate_id.strip().casefold()), sys.intern(role.strip().casefold())
+
+
+class _Bucket:
+    """Signatures for one (candidate, role) pair, oldest first.
+
+    All bands share one bytearray, band-major: band i holds `capacity` slots
+    of _BAND_BYTES starting at i * capacity * _BAND_BYTES, so a band can be
+    scanned with a single find(). Rows form a ring buffer starting at slot
+    `head`, so evicting the oldest is O(1). Capacity grows by about 1.5x, up
+    to the per-bucket cap, which keeps small buckets small.
+    """
+
+    __slots__ = ("key", "data", "capacity", "head", "size", "stale")
+
+    def __init__(self, key: tuple[str, str]):
+        self.key = key
+        self.data = bytearray(_SIGNATURE_BYTES)
+        self.capacity = 1
+        self.head = 0
+        self.size = 0
+        # References in QuestionIndex._order to rows already evicted from this bucket
+        self.stale = 0
+
+    def _bands(self) -> memoryview:
+        # One item per band; item (i * capacity + slot) is band i of that slot
+        return memoryview(self.data).cast(_BAND_FORMAT)
+
+    def append(self, sig: bytes, max_size: int) -> None:
+        if self.size == self.capacity:
+            self._resize(min(max_size, self.capacity + max(1, self.capacity // 2)))
+        slot = (self.head + self.size) % self.capacity
+        self._bands()[slot::self.capacity] = memoryview(sig).cast(_BAND_FORMAT)
+        self.size += 1
+
+    def pop_oldest(self) -> None:
+        self.head = (self.head + 1) % self.capacity
+        self.size -= 1
+
+    def clear(self) -> None:
+        """Release the storage of a bucket dropped from the index."""
+        self.data = bytearray()
+        self.size = 0
+
+    def _resize(self, capacity: int) -> None:
+        old = self._bands()
+        new_data = bytearray(capacity * _SIGNATURE_BYTES)
+        new = memoryview(new_data).cast(_BAND_FORMAT)
+        for row in range(self.size):
+            new[row::capacity] = old[(self.head + row) % self.capacity::self.capacity]
+        old.release()
+        self.data = new_data
+        self.capacity = capacity
+        self.head = 0
+
+    def row(self, index: int) -> bytes:
+        slot = (self.head + index) % self.capacity
+        return self._bands()[slot::self.capacity].tobytes()
+
+    def rows_sharing_band(self, band_index: int, sig: bytes) -> Iterator[int]:
+        """Rows whose band `band_index` equals that of sig."""
+        needle = sig[band_index * _BAND_BYTES:(band_index + 1) * _BAND_BYTES]
+        start = band_index * self.capacity * _BAND_BYTES
+        end = start + self.capacity * _BAND_BYTES
+        pos = self.data.find(needle, start, end)
+        while pos != -1:
+            offset = pos - start
+            if offset % _BAND_BYTES:
+                # Unaligned hit straddling two slots
+                pos = self.data.find(needle, pos + 1, end)
+                continue
+            row = (offset // _BAND_BYTES - self.head) % self.capacity
+            if row < self.size:
+                yield row
+            pos = self.data.find(needle, pos + _BAND_BYTES, end)
+
+    def copy(self) -> "_Bucket":
+        """Immutable copy of the rows, for reading from a worker thread."""
+        clone = _Bucket.__new__(_Bucket)
+        clone.key = self.key
+        clone.data = bytes(self.data)
+        clone.capacity = self.capacity
+        clone.head = self.head
+        clone.size = self.size
+        clone.stale = 0
+        return clone
+
+
+class QuestionIndex:
+    """MinHash/LSH index of asked questions, bounded and persisted to disk.
+
+    `record` only updates memory; `flush` writes pending entries to the log
+    (and compacts it) in a worker thread, so callers on the event loop never
+    block on file I/O.
+
+    Args:
+        path: JSONL file used to persist signatures. Empty keeps the index in memory only.
+        threshold: Estimated Jaccard similarity at or above which a question is a near-duplicate.
+        max_entries: Total signatures kept; the oldest are evicted first.
+        max_per_bucket: Signatures kept per (candidate, role) pair. Lookups scan
+            one bucket, so this also bounds lookup time.
+        max_buckets: (candidate, role) pairs kept; the pair holding the oldest
+            entry is dropped whole when a new one would exceed it.
+    """
+
+    def __init__(self, path: str = "", threshold: float = 0.3,
+                 max_entries: int = 200_000, max_per_bucket: int = 1_000,
+                 max_buckets: int = 50_000):
+        self.path = path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_per_bucket = max_per_bucket
+        self.max_buckets = max_buckets
+
+        self._buckets: dict[tuple[str, str], _Bucket] = {}
+        # Insertion order across buckets; the i-th live reference to a bucket is its i-th row
+        self._order: deque[_Bucket] = deque()
+        self._size = 0
+        self._log_lines = 0
+        self._unwritten: list[str] = []
+        self._io_lock = asyncio.Lock()
+
+        if self.path:
+            self._load()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def find_duplicate(self, candidate_id: str, role: str, question: str) -> float | None:
+        """Return the similarity of a stored near-duplicate of question, or None."""
+        return self._match(_bucket_key(candidate_id, role), signature(question))
+
+    def filter_new(self, candidate_id: str, role: str,
+                   questions: list[str]) -> tuple[list[str], list[str]]:
+        """Split questions into (fresh, duplicates).
+
+        A question is a duplicate if it is close to one already recorded for
+        this candidate and role, or to an earlier fresh question in the list.
+        """
+        key = _bucket_key(candidate_id, role)
+        seen: list[bytes] = []
+        fresh, duplicates = [], []
+
+        for question in questions:
+            sig = signature(question)
+            if (self._match(key, sig) is not None
+                    or any(similarity(sig, s) >= self.threshold for s in seen)):
+                duplicates.append(question)
+                continue
+            fresh.append(question)
+            seen.append(sig)
+
+        return fresh, duplicates
+
+    def distinct(self, questions: list[str], exclude: list[str] | None = None) -> list[str]:
+        """Questions not close to any in `exclude` or to an earlier one in the list.
+
+        Only compares the given questions with each other; the index is not consulted.
+        """
+        seen = [signature(q) for q in exclude or []]
+        kept = []
+
+        for question in questions:
+            sig = signature(question)
+            if any(similarity(sig, s) >= self.threshold for s in seen):
+                continue
+            kept.append(question)
+            seen.append(sig)
+
+        return kept
+
+    def record(self, candidate_id: str, role: str, questions: list[str]) -> None:
+        """Store asked questions in memory and queue them for the on-disk log."""
+        key = _bucket_key(candidate_id, role)
+        for question in questions:
+            sig = signature(question)
+            self._insert(key, sig)
+            if self.path:
+                self._unwritten.append(_encode(key, sig))
+
+    async def flush(self) -> None:
+        """Append queued entries to the log, compacting it once it is mostly evicted entries."""
+        if not self.path:
+            return
+
+        async with self._io_lock:
+            lines, self._unwritten = self._unwritten, []
+            if lines:
+                await asyncio.to_thread(self._append, lines)
+                self._log_lines += len(lines)
+
+            if self._log_lines > 2 * self._size + 1_000:
+                # The snapshot covers everything recorded so far, including entries
+                # still queued; later records go to the compacted log on the next flush.
+                snapshot = self._snapshot()
+                self._unwritten = []
+                await asyncio.to_thread(self._write_snapshot, *snapshot)
+                self._log_lines = len(snapshot[0])
+
+    def _match(self, key: tuple[str, str], sig: bytes) -> float | None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return None
+
+        hits = Counter()
+        for band_index in range(NUM_BANDS):
+            for row in bucket.rows_sharing_band(band_index, sig):
+                hits[row] += 1
+                if hits[row] == MIN_BAND_HITS:
+                    score = similarity(sig, bucket.row(row))
+                    if score >= self.threshold:
+                        return score
+        return None
+
+    def _insert(self, key: tuple[str, str], sig: bytes) -> None:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            while len(self._buckets) >= self.max_buckets:
+                self._evict_oldest_bucket()
+            bucket = self._buckets[key] = _Bucket(key)
+
+        if bucket.size >= self.max_per_bucket:
+            bucket.pop_oldest()
+            bucket.stale += 1
+            self._size -= 1
+        bucket.append(sig, self.max_per_bucket)
+        self._order.append(bucket)
+        self._size += 1
+
+        while self._size > self.max_entries:
+            self._evict_oldest()
+        if len(self._order) > 2 * self._size + 1_000:
+            self._prune_order()
+
+    def _evict_oldest(self) -> None:
+        while True:
+            bucket = self._order.popleft()
+            if bucket.stale:
+                bucket.stale -= 1
+                continue
+            bucket.pop_oldest()
+            self._size -= 1
+            if not bucket.size:
+                del self._buckets[bucket.key]
+                bucket.clear()
+            return
+
+    def _evict_oldest_bucket(self) -> None:
+        """Drop the whole bucket holding the oldest entry."""
+        while True:
+            bucket = self._order.popleft()
+            if bucket.stale:
+                bucket.stale -= 1
+                continue
+            # Its remaining references in _order are skipped as stale from now on
+            bucket.stale = bucket.size - 1
+            self._size -= bucket.size
+            del self._buckets[bucket.key]
+            bucket.clear()
+            return
+
+    def _prune_order(self) -> None:
+        """Drop references to rows already evicted from their bucket."""
+        order = deque()
+        for bucket in self._order:
+            if bucket.stale:
+                bucket.stale -= 1
+            else:
+                order.append(bucket)
+        self._order = order
+
+    def _snapshot(self) -> tuple[list[tuple[str, str]], dict[tuple[str, str], _Bucket]]:
+        """Copy live entries cheaply (keys in order plus bucket copies) for a worker thread."""
+        self._prune_order()
+        order = [bucket.key for bucket in self._order]
+        buckets = {key: bucket.copy() for key, bucket in self._buckets.items()}
+        return order, buckets
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    key, sig = _decode(line)
+                except (ValueError, KeyError, TypeError):
+                    continue  # Skip a torn or corrupt line rather than failing startup
+                self._insert(key, sig)
+                self._log_lines += 1
+
+    def _append(self, lines: list[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+
+    def _write_snapshot(self, order: list[tuple[str, str]],
+                        buckets: dict[tuple[str, str], _Bucket]) -> None:
+        """Rewrite the log with only the live entries, replacing it atomically."""
+        rows: dict[tuple[str, str], int] = {}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key in order:
+                row = rows.get(key, 0)
+                rows[key] = row + 1
+                f.write(_encode(key, buckets[key].row(row)) + "\n")
+        os.replace(tmp_path, self.path)
+
+
+def _encode(key: tuple[str, str], sig: bytes) -> str:
+    return json.dumps({"c": key[0], "r": key[1], "s": base64.b64encode(sig).decode("ascii")})
+
+
+def _decode(line: str) -> tuple[tuple[str, str], bytes]:
+    record = json.loads(line)
+    sig = base64.b64decode(record["s"])
+    if len(sig) != _SIGNATURE_BYTES:
+        raise ValueError("Signature size mismatch")
+    return _bucket_key(record["c"], record["r"]), sig
+
+
+_index = None
+
+def get_index() -> QuestionIndex:
+    """Shared index instance, loaded from disk on first use.
+
+    The app loads it at startup in a worker thread (see main.py) so the first
+    request doesn't pay for reading the log.
+    """
+    global _index
+    if _index is None:
+        settings = get_settings()
+        path = settings.QUESTION_INDEX_PATH
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        _index = QuestionIndex(
+            path=path,
+            threshold=settings.QUESTION_DUPLICATE_THRESHOLD,
+            max_entries=settings.QUESTION_INDEX_MAX_ENTRIES,
+            max_per_bucket=settings.QUESTION_INDEX_MAX_PER_CANDIDATE_ROLE,
+            max_buckets=settings.QUESTION_INDEX_MAX_CANDIDATE_ROLES,
+        )
+    return _index
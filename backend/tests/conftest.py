@@ -0,0 +1,6 @@
+"""Make the backend's top-level modules importable wherever pytest is run from."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,89 @@
+"""Tests for question generation in the interview router."""
+
+import asyncio
+
+import pytest
+
+from models import InterviewStartRequest
+from routers import interview
+from services import llm_service, question_index
+from services.question_index import QuestionIndex
+
+ROLE = "Backend Developer"
+
+
+@pytest.fixture
+def index(monkeypatch):
+    index = QuestionIndex()
+    monkeypatch.setattr(question_index, "_index", index)
+    return index
+
+
+def stub_llm(monkeypatch, *batches):
+    """Make generate_questions return `batches` in turn (raising any exception) and log its calls."""
+    calls = []
+    replies = iter(batches)
+
+    async def generate_questions(role, num_questions=5, resume_text=None, avoid=None):
+        calls.append({"num_questions": num_questions, "avoid": avoid})
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply[:num_questions]
+
+    monkeypatch.setattr(llm_service, "generate_questions", generate_questions)
+    return calls
+
+
+def start(num_questions=3):
+    req = InterviewStartRequest(role=ROLE, num_questions=num_questions, candidate_id="alice")
+    return asyncio.run(interview._generate_fresh_questions(req))
+
+
+def test_regenerates_repeats_and_records_fresh(monkeypatch, index):
+    index.record("alice", ROLE, ["Explain the CAP theorem."])
+    calls = stub_llm(
+        monkeypatch,
+        ["Explain CAP theorem.", "What is a B-tree?"],
+        ["What is Raft?", "What is Paxos?"],
+    )
+
+    questions = start()
+
+    assert questions == ["What is a B-tree?", "What is Raft?", "What is Paxos?"]
+    assert calls[1] == {"num_questions": 2, "avoid": ["What is a B-tree?", "Explain CAP theorem."]}
+    assert len(index) == 4
+
+
+def test_fallback_never_serves_a_question_twice(monkeypatch, index):
+    index.record("alice", ROLE, ["Explain the CAP theorem."])
+    batch = ["What is eventual consistency?", "Explain CAP theorem."]
+    stub_llm(monkeypatch, batch, batch, batch)
+
+    questions = start()
+
+    assert questions == ["What is eventual consistency?", "Explain CAP theorem."]
+    # The fallback repeat is served but not recorded a second time
+    assert len(index) == 2
+
+
+def test_failed_regeneration_returns_collected_questions(monkeypatch, index):
+    stub_llm(
+        monkeypatch,
+        ["What is eventual consistency?", "What is eventual consistency in a database?"],
+        ValueError("invalid JSON"),
+    )
+
+    questions = start()
+
+    assert questions == ["What is eventual consistency?"]
+    assert len(index) == 1
+
+
+def test_failed_first_round_records_nothing(monkeypatch, index):
+    stub_llm(monkeypatch, ValueError("invalid JSON"))
+
+    with pytest.raises(ValueError):
+        start()
+
+    assert len(index) == 0
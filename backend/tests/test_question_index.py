@@ -0,0 +1,182 @@
+"""Tests for the near-duplicate question index."""
+
+import asyncio
+
+import pytest
+
+from services.question_index import QuestionIndex, _Bucket, signature, similarity
+
+PARAPHRASES = [
+    ("Explain CAP theorem.", "Explain the CAP theorem."),
+    ("How does React's virtual DOM work?", "How does the virtual DOM in React work?"),
+    ("Tell me about a time you resolved a conflict with a teammate.",
+     "Describe a time when you resolved a conflict with a coworker."),
+    ("What is the difference between a process and a thread?",
+     "Can you explain the difference between processes and threads?"),
+    ("How would you design a URL shortener?",
+     "Walk me through how you would design a URL shortening service."),
+    ("What are Python decorators and when would you use them?",
+     "When would you use a decorator in Python, and what is it?"),
+    ("How do you handle database schema migrations in production?",
+     "How do you manage database migrations in a production environment?"),
+    ("What is the event loop in JavaScript?", "Explain the JavaScript event loop."),
+    ("Как работает сборщик мусора?", "Как работает сборщик мусора в Java?"),
+]
+
+DISTINCT = [
+    ("Explain CAP theorem.", "Explain the virtual DOM."),
+    ("How would you design a URL shortener?", "How would you design a rate limiter?"),
+    ("Tell me about a time you resolved a conflict with a teammate.",
+     "Tell me about a time you missed a deadline."),
+    ("What is the difference between a process and a thread?",
+     "What is the difference between TCP and UDP?"),
+    ("What are Python decorators and when would you use them?",
+     "What are Python generators and when would you use them?"),
+    ("How do you handle database schema migrations in production?",
+     "How do you handle secrets management in production?"),
+    ("Explain how a hash map works internally.", "Explain how a B-tree index works internally."),
+    ("What is Kubernetes and why would you use it?", "What is Terraform and why would you use it?"),
+    ("Как работает сборщик мусора?", "Что такое замыкание?"),
+    ("???", "!!!"),
+]
+
+
+@pytest.mark.parametrize("asked, candidate", PARAPHRASES)
+def test_paraphrase_is_duplicate(asked, candidate):
+    index = QuestionIndex()
+    index.record("alice", "Backend Developer", [asked])
+
+    assert index.find_duplicate("alice", "Backend Developer", candidate) is not None
+
+
+@pytest.mark.parametrize("asked, candidate", DISTINCT)
+def test_distinct_question_is_fresh(asked, candidate):
+    index = QuestionIndex()
+    index.record("alice", "Backend Developer", [asked])
+
+    assert index.find_duplicate("alice", "Backend Developer", candidate) is None
+
+
+def test_identical_text_has_full_similarity():
+    sig = signature("What is dependency injection?")
+    assert similarity(sig, signature("what is DEPENDENCY injection")) == 1.0
+
+
+def test_buckets_are_per_candidate_and_role():
+    index = QuestionIndex()
+    index.record("alice", "Backend Developer", ["Explain the CAP theorem."])
+
+    assert index.find_duplicate("ALICE ", "backend developer", "Explain CAP theorem.") is not None
+    assert index.find_duplicate("bob", "Backend Developer", "Explain CAP theorem.") is None
+    assert index.find_duplicate("alice", "DevOps Engineer", "Explain CAP theorem.") is None
+
+
+def test_filter_new_drops_repeats_within_batch():
+    index = QuestionIndex()
+    index.record("alice", "Backend Developer", ["Explain the CAP theorem."])
+
+    fresh, duplicates = index.filter_new("alice", "Backend Developer", [
+        "Explain CAP theorem.",
+        "How would you design a rate limiter?",
+        "How would you design a rate limiter for an API?",
+        "What is eventual consistency?",
+    ])
+
+    assert fresh == ["How would you design a rate limiter?", "What is eventual consistency?"]
+    assert duplicates == ["Explain CAP theorem.", "How would you design a rate limiter for an API?"]
+
+
+def test_per_bucket_cap_evicts_oldest():
+    index = QuestionIndex(max_per_bucket=2)
+    index.record("alice", "Backend", ["Explain the CAP theorem.", "What is a B-tree?", "What is Raft?"])
+
+    assert len(index) == 2
+    assert index.find_duplicate("alice", "Backend", "Explain the CAP theorem.") is None
+    assert index.find_duplicate("alice", "Backend", "What is Raft?") is not None
+
+
+def test_global_cap_evicts_oldest_across_buckets():
+    index = QuestionIndex(max_entries=2)
+    index.record("alice", "Backend", ["Explain the CAP theorem."])
+    index.record("bob", "Backend", ["What is a B-tree?"])
+    index.record("carol", "Backend", ["What is Raft?"])
+
+    assert len(index) == 2
+    assert index.find_duplicate("alice", "Backend", "Explain the CAP theorem.") is None
+    assert index.find_duplicate("bob", "Backend", "What is a B-tree?") is not None
+
+
+def test_bucket_cap_drops_pair_with_oldest_entry():
+    index = QuestionIndex(max_buckets=2)
+    index.record("alice", "Backend", ["Explain the CAP theorem.", "What is Raft?"])
+    index.record("bob", "Backend", ["What is a B-tree?"])
+    index.record("carol", "Backend", ["What is Paxos?"])
+
+    assert len(index) == 2
+    assert index.find_duplicate("alice", "Backend", "What is Raft?") is None
+    assert index.find_duplicate("bob", "Backend", "What is a B-tree?") is not None
+    assert index.find_duplicate("carol", "Backend", "What is Paxos?") is not None
+
+
+def test_bucket_ring_buffer_wraps_and_grows():
+    sigs = [signature(f"What is tool{i}?") for i in range(8)]
+    bucket = _Bucket(("alice", "backend"))
+    for sig in sigs[:3]:
+        bucket.append(sig, max_size=100)
+    bucket.pop_oldest()
+    bucket.pop_oldest()
+    # Fill the ring past its end, then grow it while the head is mid-buffer
+    for sig in sigs[3:]:
+        bucket.append(sig, max_size=100)
+
+    assert bucket.size == 6
+    assert [bucket.row(i) for i in range(bucket.size)] == sigs[2:]
+    assert set(bucket.rows_sharing_band(0, sigs[5])) == {3}
+
+
+def test_persist_and_reload(tmp_path):
+    path = str(tmp_path / "index.jsonl")
+    index = QuestionIndex(path=path)
+    index.record("alice", "Backend", ["Explain the CAP theorem.", "Как работает сборщик мусора?"])
+    index.record("bob", "Frontend", ["How does the virtual DOM work?"])
+    asyncio.run(index.flush())
+
+    reloaded = QuestionIndex(path=path)
+
+    assert len(reloaded) == 3
+    assert reloaded.find_duplicate("alice", "Backend", "Explain CAP theorem.") is not None
+    assert reloaded.find_duplicate("alice", "Backend", "Как работает сборщик мусора в Java?") is not None
+    assert reloaded.find_duplicate("bob", "Frontend", "How does React's virtual DOM work?") is not None
+    assert reloaded.find_duplicate("bob", "Backend", "Explain CAP theorem.") is None
+
+
+def test_compaction_keeps_live_entries_in_order(tmp_path):
+    path = str(tmp_path / "index.jsonl")
+    index = QuestionIndex(path=path, max_per_bucket=3)
+    questions = [f"What is tool{i}?" for i in range(1_500)]
+    for question in questions:
+        index.record("alice", "DevOps", [question])
+    index.record("bob", "DevOps", ["What is a service mesh?"])
+    asyncio.run(index.flush())
+
+    with open(path, encoding="utf-8") as f:
+        assert sum(1 for _ in f) == 4
+
+    # Reloading with a smaller cap must evict in the original insertion order
+    reloaded = QuestionIndex(path=path, max_entries=2)
+    assert reloaded.find_duplicate("alice", "DevOps", questions[-1]) is not None
+    assert reloaded.find_duplicate("alice", "DevOps", questions[-3]) is None
+    assert reloaded.find_duplicate("bob", "DevOps", "What is a service mesh?") is not None
+
+
+def test_corrupt_log_lines_are_skipped(tmp_path):
+    path = tmp_path / "index.jsonl"
+    index = QuestionIndex(path=str(path))
+    index.record("alice", "Backend", ["Explain the CAP theorem."])
+    asyncio.run(index.flush())
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"c": "alice", "r": "backend", "s": "tru')
+
+    reloaded = QuestionIndex(path=str(path))
+
+    assert len(reloaded) == 1
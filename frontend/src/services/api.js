@@ -5,12 +5,36 @@ const api = axios.create({
     timeout: 60000,
 });
 
+/* ---------- Candidate ---------- */
+const CANDIDATE_ID_KEY = 'candidateId';
+
+// crypto.randomUUID only exists in secure contexts (HTTPS or localhost);
+// getRandomValues is available everywhere, e.g. when served from a LAN IP.
+function randomId() {
+    if (crypto.randomUUID) {
+        return crypto.randomUUID();
+    }
+    const bytes = crypto.getRandomValues(new Uint8Array(16));
+    return Array.from(bytes, (b) => b.toString(16).padStart(2, '0')).join('');
+}
+
+// Stable per-browser id so the backend doesn't repeat questions across sessions
+function getCandidateId() {
+    let id = localStorage.getItem(CANDIDATE_ID_KEY);
+    if (!id) {
+        id = randomId();
+        localStorage.setItem(CANDIDATE_ID_KEY, id);
+    }
+    return id;
+}
+
 /* ---------- Interview ---------- */
 export async function startInterview(role, numQuestions, resumeText = null) {
     const { data } = await api.post('/interview/start', {
         role,
         num_questions: numQuestions,
         resume_text: resumeText,
+        candidate_id: getCandidateId(),
     });
     return data;
 }